@@ -0,0 +1,25 @@
+"""
+Gunicorn config for production:
+    gunicorn -c gunicorn_conf.py app:app
+The dev server (python app.py) is single-threaded; the handlers spend most of
+their time waiting on MySQL, so gevent workers let each worker overlap many
+requests' DB waits.
+"""
+import multiprocessing
+import os
+
+# Force the pure-Python MySQL driver: mysqlclient's blocking C calls can't be
+# monkey-patched and would stall the whole gevent event loop. Must be set
+# before app.py's driver import runs (preload_app).
+os.environ.setdefault('MYSQL_PURE_PYTHON', '1')
+
+# Patch the stdlib before app.py is imported (preload_app) so the pure-Python
+# MySQL driver becomes cooperative under gevent.
+from gevent import monkey
+monkey.patch_all()
+
+bind = '0.0.0.0:8000'
+workers = multiprocessing.cpu_count() * 2 + 1
+worker_class = 'gevent'
+worker_connections = 1000
+preload_app = True